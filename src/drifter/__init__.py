@@ -1,17 +1,32 @@
-"""Drifter package."""
+"""Drifter package.
 
+Tracks how the schemas of DataFrames change over time. Registration is bound
+by memory and I/O rather than computation, so the code keeps allocations,
+dict lookups and bytes read down; instruction-level tricks do not pay off
+here.
+"""
+
+import ast
 import base64
-import json
+import hashlib
+import os
+import threading
+import weakref
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
-from typing import TypedDict
+from time import time_ns
+from typing import BinaryIO, Protocol, TypedDict, cast
 
+import orjson
 import polars as pl
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ColumnChange:
     """Represents a change in a column's schema."""
 
@@ -20,13 +35,13 @@ class ColumnChange:
     new_type: pl.DataType | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SchemaChange:
     """Represents changes between two schemas."""
 
-    added: list[ColumnChange] = field(default_factory=list)
-    removed: list[ColumnChange] = field(default_factory=list)
-    changed: list[ColumnChange] = field(default_factory=list)
+    added: tuple[ColumnChange, ...] = ()
+    removed: tuple[ColumnChange, ...] = ()
+    changed: tuple[ColumnChange, ...] = ()
 
     def __bool__(self) -> bool:
         """Return True if there are any changes."""
@@ -36,118 +51,646 @@ class SchemaChange:
 class SchemaVersion(TypedDict):
     """Represents a version of a schema."""
 
-    dataframe: str  # Base64 encoded serialized DataFrame
-    timestamp: str  # ISO 8601 timestamp
+    schema: dict[str, str]  # Column names mapped to their data types
+    fingerprint: str  # Hash of the schema, see _fingerprint
+    timestamp: int  # Nanoseconds since the Unix epoch
+
+
+class HistoryStore(Protocol):
+    """Storage for the schema histories of sources.
+
+    Registrations of a source are serialized per store. Stores that do not
+    support weak references, such as slotted classes without a
+    ``__weakref__`` slot, share their locks with each other instead.
+    """
+
+    def latest(self, source_id: str) -> SchemaVersion | None:
+        """Get the latest schema version of a source, or None if it has none."""
+
+    def append(self, source_id: str, version: SchemaVersion) -> None:
+        """Append a schema version to the history of a source."""
+
+
+# Latest versions already read by this process, keyed by absolute file path
+# and stored with the size and modification time they were read at
+_LATEST_CACHE: dict[Path, tuple[SchemaVersion | None, tuple[int, int]]] = {}
+
+# Legacy histories already converted by this process, keyed and stamped alike
+_LEGACY_CACHE: dict[Path, tuple[tuple[SchemaVersion, ...], tuple[int, int]]] = {}
 
+# Locks serializing registrations of the same source: file system stores
+# share them per schema file, other stores have their own while they are
+# alive, keyed by identity so they need not be hashable, and stores that
+# cannot be weakly referenced share one per source
+_FILE_LOCKS: dict[Path, threading.Lock] = {}
+_STORE_LOCKS: dict[int, dict[str, threading.Lock]] = {}
+_SHARED_LOCKS: dict[str, threading.Lock] = {}
+_REGISTRATION_LOCKS_GUARD = threading.Lock()
 
-def _load_history(file: Path) -> list[SchemaVersion]:
-    """Load schema history from a file.
+# Bytes read at a time when scanning a schema file backwards
+_TAIL_CHUNK_SIZE = 64 * 1024
+
+# Directory of the schema files, relative to the working directory
+_DEFAULT_DIRECTORY = Path(".drifter")
+
+# Start of the Unix epoch, which timestamps are counted from
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+# Polars classes other than data types that data types take as parameters
+_DTYPE_PARAMETERS = frozenset({"Categories"})
+
+
+def _load_latest(file: Path) -> SchemaVersion | None:
+    """Load the latest schema version from a file.
+
+    Only the tail of the file is read, so the cost does not grow with the
+    length of the history. The version is served from memory while the file
+    is left unmodified. Lines that do not hold a version, such as a record
+    torn by an interrupted write, are skipped in favour of the one before them.
 
     Args:
-        file: Path to the schema file.
+        file: Absolute path to the schema file, one JSON version per line.
 
     Returns:
-        List of schema versions.
+        The latest schema version, or None if the file holds none.
 
     """
-    if not file.exists():
-        return []
+    try:
+        stamp = _file_stamp(file)
+    except FileNotFoundError:
+        return None
+
+    cached = _LATEST_CACHE.get(file)
+    if cached is not None and cached[1] == stamp:
+        return cached[0]
 
     try:
-        return json.loads(file.read_text())
-    except (json.JSONDecodeError, KeyError, TypeError):
-        return []
+        with file.open("rb") as f:
+            latest = _read_last_version(f)
+    except FileNotFoundError:
+        return None
+
+    _LATEST_CACHE[file] = (latest, stamp)
+    return latest
 
 
-def _save_history(file: Path, history: list[SchemaVersion]) -> None:
-    """Save schema history to a file.
+def _file_stamp(file: Path) -> tuple[int, int]:
+    """Get the size and modification time of a file.
+
+    The size catches writes that land within the filesystem's timestamp
+    granularity, which the modification time alone would miss.
 
     Args:
-        file: Path to save the schema file.
-        history: List of schema versions to save.
+        file: Path to the file.
+
+    Returns:
+        The size in bytes and the modification time in nanoseconds.
 
     """
-    file.parent.mkdir(exist_ok=True)
-    file.write_text(json.dumps(history, indent=2))
+    stat = file.stat()
+    return stat.st_size, stat.st_mtime_ns
 
 
-def _compare_schemas(old_df: pl.DataFrame, new_df: pl.DataFrame) -> SchemaChange:
-    """Compare two DataFrame schemas and return the differences.
+def _read_last_version(f: BinaryIO) -> SchemaVersion | None:
+    """Find the last decodable line of a file by reading it backwards.
 
     Args:
-        old_df: The previous DataFrame.
-        new_df: The new DataFrame.
+        f: The schema file, opened for binary reading.
 
     Returns:
-        A SchemaChange object describing the differences between the schemas.
+        The decoded schema version, or None if no line holds one.
+
+    """
+    position = f.seek(0, os.SEEK_END)
+    partial = b""
+    while position > 0:
+        size = min(_TAIL_CHUNK_SIZE, position)
+        position -= size
+        f.seek(position)
+        lines = (f.read(size) + partial).split(b"\n")
+        # Unless the start of the file was reached, the first line is partial
+        partial = lines.pop(0) if position else b""
+        for line in reversed(lines):
+            try:
+                version = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
+            if isinstance(version, dict) and "schema" in version:
+                return cast("SchemaVersion", version)
+    return None
+
+
+def _append_version(file: Path, version: SchemaVersion) -> None:
+    """Append a schema version to its file.
+
+    A file without any readable version is atomically replaced with one
+    holding only the new version.
+
+    Args:
+        file: Absolute path to the schema file.
+        version: The schema version to append.
+
+    """
+    if _load_latest(file) is not None:
+        record = orjson.dumps(version) + b"\n"
+        with file.open("a+b") as f:
+            # Keep a record torn by an interrupted write on a line of its own
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                f.seek(end - 1)
+                if f.read(1) != b"\n":
+                    record = b"\n" + record
+            f.write(record)
+        _LATEST_CACHE[file] = (version, _file_stamp(file))
+    else:
+        _write_versions(file, (version,))
+
+
+def _write_versions(file: Path, versions: tuple[SchemaVersion, ...]) -> None:
+    """Atomically replace a schema file with the given versions.
+
+    Args:
+        file: Absolute path to the schema file.
+        versions: The schema versions to write, oldest first.
+
+    """
+    file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = file.with_suffix(f"{file.suffix}.tmp")
+    tmp.write_bytes(b"".join(orjson.dumps(version) + b"\n" for version in versions))
+    tmp.replace(file)
+
+    _LATEST_CACHE[file] = (versions[-1], _file_stamp(file))
+
+
+def _load_legacy_history(file: Path) -> tuple[SchemaVersion, ...]:
+    """Load a history kept in the legacy JSON format.
+
+    Histories used to be a single JSON array per source, each version
+    holding an empty DataFrame serialized by Polars. They are converted in
+    memory only, and written as JSON Lines along with the next version, so
+    reading never writes. Versions that can no longer be read are dropped.
+
+    Args:
+        file: Absolute path to the JSON Lines schema file of the source, next
+            to which the legacy file is looked for.
+
+    Returns:
+        The converted versions, oldest first, or none if there is no
+        readable legacy history.
 
     """
-    added = [
-        ColumnChange(name=name, new_type=dtype)
-        for name, dtype in new_df.schema.items()
-        if name not in old_df.schema
-    ]
-    removed = [
-        ColumnChange(name=name, old_type=dtype)
-        for name, dtype in old_df.schema.items()
-        if name not in new_df.schema
-    ]
-    changed = [
-        ColumnChange(
-            name=name,
-            old_type=old_df.schema[name],
-            new_type=new_df.schema[name],
+    legacy_file = file.with_suffix(".json")
+    try:
+        stamp = _file_stamp(legacy_file)
+    except FileNotFoundError:
+        return ()
+
+    cached = _LEGACY_CACHE.get(legacy_file)
+    if cached is not None and cached[1] == stamp:
+        return cached[0]
+
+    try:
+        legacy = orjson.loads(legacy_file.read_bytes())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return ()
+
+    versions: list[SchemaVersion] = []
+    for version in legacy if isinstance(legacy, list) else []:
+        try:
+            dtypes = pl.DataFrame.deserialize(
+                BytesIO(base64.b64decode(version["dataframe"])),
+            ).schema
+            timestamp = datetime.fromisoformat(version["timestamp"]) - _EPOCH
+        except (pl.exceptions.PolarsError, OSError, ValueError, KeyError, TypeError):
+            continue
+        schema = {name: str(dtype) for name, dtype in dtypes.items()}
+        versions.append(
+            {
+                "schema": schema,
+                "fingerprint": _fingerprint(schema),
+                "timestamp": timestamp // timedelta(microseconds=1) * 1000,
+            },
         )
-        for name in old_df.schema.keys() & new_df.schema.keys()
-        if old_df.schema[name] != new_df.schema[name]
-    ]
 
-    return SchemaChange(added=added, removed=removed, changed=changed)
+    _LEGACY_CACHE[legacy_file] = (tuple(versions), stamp)
+    return tuple(versions)
+
+
+@lru_cache(maxsize=256)
+def _history_file(directory: Path, source_id: str) -> Path:
+    """Get the path of the schema file for a source.
+
+    Args:
+        directory: The directory holding the schema files.
+        source_id: The source of the data.
+
+    Returns:
+        The path of the schema file, relative to the working directory
+        unless the directory is absolute.
+
+    """
+    return directory / f"{source_id}.jsonl"
+
+
+@dataclass(frozen=True, slots=True, init=False)
+class FileSystemStore:
+    """Stores schema histories as JSON Lines files, one file per source.
+
+    Each new version is appended to its source's file as a single line.
+    """
+
+    directory: Path
+
+    def __init__(self, directory: str | os.PathLike[str] = _DEFAULT_DIRECTORY) -> None:
+        """Keep schema files in a directory, created on the first write."""
+        object.__setattr__(self, "directory", Path(directory))
+
+    def latest(self, source_id: str) -> SchemaVersion | None:
+        """Get the latest schema version of a source, or None if it has none."""
+        file = _history_file(self.directory, source_id).absolute()
+        latest = _load_latest(file)
+        if latest is None and not file.exists():
+            legacy = _load_legacy_history(file)
+            return legacy[-1] if legacy else None
+        return latest
+
+    def append(self, source_id: str, version: SchemaVersion) -> None:
+        """Append a schema version to the history of a source."""
+        file = _history_file(self.directory, source_id).absolute()
+        legacy = () if file.exists() else _load_legacy_history(file)
+        if legacy:
+            _write_versions(file, (*legacy, version))
+        else:
+            _append_version(file, version)
+
+
+@dataclass(eq=False, slots=True, weakref_slot=True)
+class InMemoryStore:
+    """Keeps schema histories in memory for as long as the store is alive.
+
+    Useful when histories need not outlive the process, as in tests or for
+    sources registered at a high rate.
+    """
+
+    histories: dict[str, list[SchemaVersion]] = field(default_factory=dict)
+
+    def latest(self, source_id: str) -> SchemaVersion | None:
+        """Get the latest schema version of a source, or None if it has none."""
+        history = self.histories.get(source_id)
+        return history[-1] if history else None
+
+    def append(self, source_id: str, version: SchemaVersion) -> None:
+        """Append a schema version to the history of a source."""
+        self.histories.setdefault(source_id, []).append(version)
+
+
+# Where histories are kept unless a store is given
+_DEFAULT_STORE = FileSystemStore()
+
+
+@lru_cache(maxsize=256)
+def _parse_dtype(text: str) -> pl.DataType:
+    """Rebuild a Polars data type from its string representation.
+
+    Results are cached, as schemas tend to repeat a few distinct types.
+    Stored histories may have been written by another Polars version, so a
+    type that cannot be rebuilt falls back to its class with default
+    parameters, or to ``pl.Unknown`` if the class is unknown as well.
+
+    Args:
+        text: A data type as produced by ``str(dtype)``, e.g. ``"List(Int64)"``.
+
+    Returns:
+        The corresponding Polars data type.
+
+    """
+    try:
+        # Most types are plain names like "Int64" that need no parsing
+        if text.isidentifier():
+            return _dtype_class(text)()
+        dtype = _eval_dtype_node(ast.parse(text, mode="eval").body)
+    except (ValueError, TypeError, SyntaxError, pl.exceptions.PolarsError):
+        dtype = None
+    if isinstance(dtype, pl.DataType):
+        return dtype
+
+    try:
+        return _dtype_class(text.partition("(")[0])()
+    except (ValueError, TypeError, pl.exceptions.PolarsError):
+        return pl.Unknown()
+
+
+def _eval_dtype_node(node: ast.expr) -> object:
+    """Evaluate a node of a parsed data type representation.
+
+    Only Polars data type names and calls, the few other Polars classes
+    they take as arguments, and literals are accepted, so stored histories
+    cannot execute arbitrary code.
+
+    Args:
+        node: The expression node to evaluate.
+
+    Returns:
+        The Polars data type or literal value the node describes.
+
+    Raises:
+        ValueError: If the node is not part of a data type representation.
+
+    """
+    match node:
+        case ast.Name(id=name):
+            return _dtype_class(name)()
+        case ast.Attribute(value=ast.Name(id="pl"), attr=name):
+            return _dtype_class(name)
+        case ast.Call(func=ast.Name(id=name), args=args, keywords=keywords):
+            return _dtype_constructor(name)(
+                *(_eval_dtype_node(arg) for arg in args),
+                **{kw.arg: _eval_dtype_node(kw.value) for kw in keywords if kw.arg},
+            )
+        case ast.Constant(value=value):
+            return value
+        case ast.List(elts=elts) | ast.Tuple(elts=elts):
+            values = [_eval_dtype_node(elt) for elt in elts]
+            return values if isinstance(node, ast.List) else tuple(values)
+        case ast.Dict(keys=keys, values=values):
+            return {
+                _eval_dtype_node(key): _eval_dtype_node(value)
+                for key, value in zip(keys, values, strict=True)
+                if key is not None
+            }
+    msg = f"Unsupported data type expression: {ast.unparse(node)!r}"
+    raise ValueError(msg)
+
+
+def _dtype_constructor(name: str) -> Callable[..., object]:
+    """Look up a Polars class called in a data type representation.
+
+    Args:
+        name: The name of the class, e.g. ``"List"`` or ``"Categories"``.
+
+    Returns:
+        The Polars class.
+
+    Raises:
+        ValueError: If the name is neither a data type nor a known parameter.
+
+    """
+    parameter = getattr(pl, name, None) if name in _DTYPE_PARAMETERS else None
+    if isinstance(parameter, type):
+        return parameter
+    return _dtype_class(name)
+
+
+def _dtype_class(name: str) -> type[pl.DataType]:
+    """Look up a Polars data type class by name.
+
+    Args:
+        name: The name of the data type class, e.g. ``"Int64"``.
+
+    Returns:
+        The Polars data type class.
+
+    Raises:
+        ValueError: If Polars has no data type class with that name.
+
+    """
+    dtype = getattr(pl, name, None)
+    if isinstance(dtype, type) and issubclass(dtype, pl.DataType):
+        return dtype
+    msg = f"Unknown Polars data type: {name!r}"
+    raise ValueError(msg)
+
+
+def _fingerprint(schema: dict[str, str]) -> str:
+    """Compute a short, stable hash of a schema.
+
+    Column order does not affect the result, just as it does not affect
+    the comparison of schemas.
+
+    Args:
+        schema: The schema, mapping column names to data types.
+
+    Returns:
+        The fingerprint as a hex string.
+
+    """
+    data = orjson.dumps(schema, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def _registration_lock(store: HistoryStore, source_id: str) -> threading.Lock:
+    """Get the lock serializing registrations of a source in a store.
 
+    File system stores writing to the same schema file share its lock. The
+    locks of other stores are dropped once the store is garbage collected,
+    before its identity can be reused by another object.
+
+    Args:
+        store: The store.
+        source_id: The source of the data.
+
+    Returns:
+        The lock for the source in the store.
 
-def register(dataframe: pl.DataFrame, source_id: str) -> SchemaChange:
+    """
+    with _REGISTRATION_LOCKS_GUARD:
+        if isinstance(store, FileSystemStore):
+            file = _history_file(store.directory, source_id).absolute()
+            return _FILE_LOCKS.setdefault(file, threading.Lock())
+
+        locks = _STORE_LOCKS.get(id(store))
+        if locks is None:
+            try:
+                weakref.finalize(store, _STORE_LOCKS.pop, id(store), None)
+            except TypeError:
+                locks = _SHARED_LOCKS
+            else:
+                locks = _STORE_LOCKS[id(store)] = {}
+        return locks.setdefault(source_id, threading.Lock())
+
+
+def _compare_schemas(
+    old_schema: dict[str, str],
+    new_schema: dict[str, str],
+    new_dtypes: Mapping[str, pl.DataType],
+) -> SchemaChange:
+    """Compare a stored schema against a new schema and return the differences.
+
+    Args:
+        old_schema: The previous schema, mapping column names to data types.
+        new_schema: The new schema, mapping column names to data types.
+        new_dtypes: The Polars data types of the new schema's columns.
+
+    Returns:
+        A SchemaChange object describing the differences between the schemas.
+
+    """
+    added: list[ColumnChange] = []
+    changed: list[ColumnChange] = []
+    for name, dtype in new_schema.items():
+        old_dtype = old_schema.get(name)
+        if old_dtype is None:
+            added.append(ColumnChange(name=name, new_type=new_dtypes[name]))
+        elif old_dtype != dtype:
+            # Polars may print the same type differently across versions
+            old_type = _parse_dtype(old_dtype)
+            if old_type != new_dtypes[name]:
+                changed.append(
+                    ColumnChange(
+                        name=name,
+                        old_type=old_type,
+                        new_type=new_dtypes[name],
+                    ),
+                )
+    removed = tuple(
+        ColumnChange(name=name, old_type=_parse_dtype(dtype))
+        for name, dtype in old_schema.items()
+        if name not in new_schema
+    )
+
+    return SchemaChange(added=tuple(added), removed=removed, changed=tuple(changed))
+
+
+def register(
+    dataframe: pl.DataFrame | pl.LazyFrame,
+    source_id: str,
+    *,
+    store: HistoryStore | None = None,
+    dry_run: bool = False,
+    clock: Callable[[], int] = time_ns,
+) -> SchemaChange:
     """Register a schema and track its changes.
 
     Args:
-        dataframe: A Polars DataFrame.
+        dataframe: A Polars DataFrame, or a LazyFrame whose schema is
+            resolved without collecting it.
         source_id: The source of the data.
+        store: Where the schema history is kept, by default in JSON Lines
+            files under ``.drifter`` in the working directory.
+        dry_run: Whether to only detect changes, leaving the history as is.
+        clock: Returns the time new versions are stamped with, in nanoseconds
+            since the Unix epoch.
 
     Returns:
         A SchemaChange object describing the changes if any were detected.
 
     """
-    # Create empty DataFrame with same schema to minimize storage
-    empty_df = dataframe.clone()
-    schema_file = Path(".drifter") / f"{source_id}.json"
-    history = _load_history(schema_file)
+    # Only the schema is needed, which a LazyFrame resolves without collecting
+    return register_schema(
+        dataframe.collect_schema(),
+        source_id,
+        store=store,
+        dry_run=dry_run,
+        clock=clock,
+    )
+
+
+def register_schema(
+    schema: Mapping[str, pl.DataType],
+    source_id: str,
+    *,
+    store: HistoryStore | None = None,
+    dry_run: bool = False,
+    clock: Callable[[], int] = time_ns,
+) -> SchemaChange:
+    """Register a schema without any data and track its changes.
 
-    # For initial registration, all columns are considered added
-    if not history:
-        changes = SchemaChange(
-            added=[
-                ColumnChange(name=name, new_type=dtype)
-                for name, dtype in empty_df.schema.items()
-            ],
-        )
-    else:
-        # Compare with latest version
-        latest = history[-1]
-        old_df = pl.DataFrame.deserialize(
-            BytesIO(base64.b64decode(latest["dataframe"])),
-        )
-        changes = _compare_schemas(old_df, empty_df)
+    Args:
+        schema: Column names mapped to their Polars data types, such as a
+            ``pl.Schema``.
+        source_id: The source of the data.
+        store: Where the schema history is kept, as for ``register``.
+        dry_run: Whether to only detect changes, leaving the history as is.
+        clock: Returns the time new versions are stamped with, in nanoseconds
+            since the Unix epoch.
 
-    # Save new version if there are changes
-    if changes:
-        history.append(
-            {
-                "dataframe": base64.b64encode(empty_df.serialize()).decode("ascii"),
-                "timestamp": datetime.now(UTC).isoformat(),
-            },
-        )
-        _save_history(schema_file, history)
+    Returns:
+        A SchemaChange object describing the changes if any were detected.
+
+    """
+    # Types are compared and stored by their string representation
+    types = {name: str(dtype) for name, dtype in schema.items()}
+    fingerprint = _fingerprint(types)
+    if store is None:
+        store = _DEFAULT_STORE
+    with _registration_lock(store, source_id):
+        latest = store.latest(source_id)
+
+        # Nothing to compare or save if the latest version has the same schema
+        if latest is not None and latest.get("fingerprint") == fingerprint:
+            return SchemaChange()
+
+        # For initial registration, all columns are considered added
+        if latest is None:
+            changes = SchemaChange(
+                added=tuple(
+                    ColumnChange(name=name, new_type=dtype)
+                    for name, dtype in schema.items()
+                ),
+            )
+        else:
+            # Compare with latest version
+            changes = _compare_schemas(latest["schema"], types, schema)
+
+        # Save new version if there are changes
+        if changes and not dry_run:
+            store.append(
+                source_id,
+                {
+                    "schema": types,
+                    "fingerprint": fingerprint,
+                    "timestamp": clock(),
+                },
+            )
 
     return changes
 
 
-__all__ = ["SchemaChange", "register"]
+def register_many(
+    items: Iterable[tuple[pl.DataFrame | pl.LazyFrame, str]],
+    *,
+    store: HistoryStore | None = None,
+    clock: Callable[[], int] = time_ns,
+) -> dict[str, SchemaChange]:
+    """Register several schemas concurrently and track their changes.
+
+    Args:
+        items: Pairs of a Polars DataFrame or LazyFrame and the source of its data.
+        store: Where the schema histories are kept, as for ``register``.
+        clock: Returns the time new versions are stamped with, as for
+            ``register``.
+
+    Returns:
+        The changes detected for each source, keyed by source.
+
+    Raises:
+        ValueError: If a source appears more than once.
+
+    """
+    pairs = list(items)
+    source_ids = [source_id for _, source_id in pairs]
+    if len(set(source_ids)) != len(source_ids):
+        msg = "Each source can only be registered once per call"
+        raise ValueError(msg)
+    if not pairs:
+        return {}
+
+    # Registration mostly waits on file I/O, so sources are handled in threads
+    with ThreadPoolExecutor(max_workers=min(32, len(pairs))) as executor:
+        changes = executor.map(
+            lambda pair: register(*pair, store=store, clock=clock),
+            pairs,
+        )
+        return dict(zip(source_ids, changes, strict=True))
+
+
+__all__ = [
+    "FileSystemStore",
+    "HistoryStore",
+    "InMemoryStore",
+    "SchemaChange",
+    "SchemaVersion",
+    "register",
+    "register_many",
+    "register_schema",
+]
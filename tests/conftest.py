@@ -0,0 +1,53 @@
+"""Shared fixtures for the test suite.
+
+DataFrames are only ever read for their schema, so they are built once per
+session and shared between tests.
+"""
+
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from drifter import FileSystemStore
+
+
+@pytest.fixture
+def schema_dir(tmp_path: Path) -> Path:
+    """Create a temporary schema directory."""
+    return tmp_path
+
+
+@pytest.fixture
+def store(schema_dir: Path) -> FileSystemStore:
+    """Create a store keeping histories in the schema directory."""
+    return FileSystemStore(schema_dir / ".drifter")
+
+
+@pytest.fixture(scope="session")
+def test_df() -> pl.DataFrame:
+    """Create a test DataFrame."""
+    return pl.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "name": ["Alice", "Bob", "Charlie"],
+            "age": [25, 30, 35],
+        },
+    )
+
+
+@pytest.fixture(scope="session")
+def updated_df() -> pl.DataFrame:
+    """Create an updated test DataFrame with schema changes."""
+    return pl.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "name": ["Alice", "Bob", "Charlie"],
+            "age": ["25", "30", "35"],  # Changed type
+            "email": [
+                "alice@example.com",
+                "bob@example.com",
+                "charlie@example.com",
+            ],  # Added
+        },
+    )
@@ -1,74 +1,43 @@
 """Tests for schema registration functionality."""
 
 import base64
+import gc
 import json
-from datetime import UTC, datetime, tzinfo
-from io import BytesIO
+import os
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
 from pathlib import Path
 
 import polars as pl
 import pytest
 
-from drifter import register
+from drifter import (
+    FileSystemStore,
+    InMemoryStore,
+    SchemaVersion,
+    register,
+    register_many,
+    register_schema,
+)
 
-
-@pytest.fixture
-def schema_dir(tmp_path: Path) -> Path:
-    """Create a temporary schema directory."""
-    return tmp_path
-
-
-@pytest.fixture
-def test_df() -> pl.DataFrame:
-    """Create a test DataFrame."""
-    return pl.DataFrame(
-        {
-            "id": [1, 2, 3],
-            "name": ["Alice", "Bob", "Charlie"],
-            "age": [25, 30, 35],
-        },
-    )
-
-
-@pytest.fixture
-def updated_df() -> pl.DataFrame:
-    """Create an updated test DataFrame with schema changes."""
-    return pl.DataFrame(
-        {
-            "id": [1, 2, 3],
-            "name": ["Alice", "Bob", "Charlie"],
-            "age": ["25", "30", "35"],  # Changed type
-            "email": [
-                "alice@example.com",
-                "bob@example.com",
-                "charlie@example.com",
-            ],  # Added
-        },
-    )
+# Fixed timestamps, in nanoseconds since the Unix epoch
+JAN_1 = 1_735_689_600_000_000_000  # 2025-01-01T00:00:00Z
+JAN_2 = 1_735_776_000_000_000_000  # 2025-01-02T00:00:00Z
 
 
 def test_initial_registration(
     test_df: pl.DataFrame,
     schema_dir: Path,
-    monkeypatch: pytest.MonkeyPatch,
+    store: FileSystemStore,
 ) -> None:
     """Test initial schema registration."""
-    # Mock datetime.now to return a fixed timestamp
-    fixed_dt = datetime(2025, 1, 1, tzinfo=UTC)
-
-    class MockDatetime:
-        UTC = UTC
+    # Stamp new versions with a fixed timestamp
+    clock = repeat(JAN_1).__next__
 
-        @classmethod
-        def now(cls, tz: tzinfo | None = None) -> datetime:
-            return fixed_dt
-
-    monkeypatch.setattr("drifter.datetime", MockDatetime)
-
-    # Change to temp directory
-    monkeypatch.chdir(schema_dir)
-
-    changes = register(test_df, "users")
+    changes = register(test_df, "users", store=store, clock=clock)
 
     # Verify changes
     assert len(changes.added) == 3
@@ -77,49 +46,30 @@ def test_initial_registration(
     assert not changes.changed
 
     # Verify schema file
-    schema_file = schema_dir / ".drifter" / "users.json"
+    schema_file = schema_dir / ".drifter" / "users.jsonl"
     assert schema_file.exists()
-    history = json.loads(schema_file.read_text())
+    history = [json.loads(line) for line in schema_file.read_text().splitlines()]
     assert len(history) == 1
-    assert history[0]["timestamp"] == "2025-01-01T00:00:00+00:00"
-    # Decode base64 and deserialize the DataFrame to verify schema
-    df_bytes = base64.b64decode(history[0]["dataframe"])
-    df1 = pl.DataFrame.deserialize(BytesIO(df_bytes))
-    assert set(df1.schema.names()) == {"id", "name", "age"}
+    assert history[0]["timestamp"] == JAN_1
+    # Verify the stored schema
+    assert set(history[0]["schema"]) == {"id", "name", "age"}
 
 
 def test_schema_changes(
     test_df: pl.DataFrame,
     updated_df: pl.DataFrame,
     schema_dir: Path,
-    monkeypatch: pytest.MonkeyPatch,
+    store: FileSystemStore,
 ) -> None:
     """Test schema changes detection."""
-    # Mock datetime.now to return fixed timestamps
-    timestamps = iter(
-        [
-            datetime(2025, 1, 1, tzinfo=UTC),
-            datetime(2025, 1, 2, tzinfo=UTC),
-        ],
-    )
-
-    class MockDatetime:
-        UTC = UTC
-
-        @classmethod
-        def now(cls, tz: tzinfo | None = None) -> datetime:
-            return next(timestamps)
-
-    monkeypatch.setattr("drifter.datetime", MockDatetime)
-
-    # Change to temp directory
-    monkeypatch.chdir(schema_dir)
+    # Stamp new versions with fixed timestamps
+    clock = iter([JAN_1, JAN_2]).__next__
 
     # Initial registration
-    register(test_df, "users")
+    register(test_df, "users", store=store, clock=clock)
 
     # Update schema
-    changes = register(updated_df, "users")
+    changes = register(updated_df, "users", store=store, clock=clock)
 
     # Verify changes
     assert len(changes.added) == 1
@@ -131,43 +81,29 @@ def test_schema_changes(
     assert changes.changed[0].new_type == pl.Utf8
 
     # Verify schema history
-    schema_file = schema_dir / ".drifter" / "users.json"
-    history = json.loads(schema_file.read_text())
+    schema_file = schema_dir / ".drifter" / "users.jsonl"
+    history = [json.loads(line) for line in schema_file.read_text().splitlines()]
     assert len(history) == 2
-    assert history[0]["timestamp"] == "2025-01-01T00:00:00+00:00"
-    assert history[1]["timestamp"] == "2025-01-02T00:00:00+00:00"
-    # Decode base64 and deserialize the latest DataFrame to verify schema
-    df_bytes = base64.b64decode(history[1]["dataframe"])
-    df1 = pl.DataFrame.deserialize(BytesIO(df_bytes))
-    assert set(df1.schema.names()) == {"id", "name", "age", "email"}
+    assert history[0]["timestamp"] == JAN_1
+    assert history[1]["timestamp"] == JAN_2
+    # Verify the latest stored schema
+    assert set(history[1]["schema"]) == {"id", "name", "age", "email"}
 
 
 def test_no_changes(
     test_df: pl.DataFrame,
     schema_dir: Path,
-    monkeypatch: pytest.MonkeyPatch,
+    store: FileSystemStore,
 ) -> None:
     """Test registering the same schema twice."""
-    # Mock datetime.now to return a fixed timestamp
-    fixed_dt = datetime(2025, 1, 1, tzinfo=UTC)
-
-    class MockDatetime:
-        UTC = UTC
-
-        @classmethod
-        def now(cls, tz: tzinfo | None = None) -> datetime:
-            return fixed_dt
-
-    monkeypatch.setattr("drifter.datetime", MockDatetime)
-
-    # Change to temp directory
-    monkeypatch.chdir(schema_dir)
+    # Stamp new versions with a fixed timestamp
+    clock = repeat(JAN_1).__next__
 
     # Initial registration
-    register(test_df, "users")
+    register(test_df, "users", store=store, clock=clock)
 
     # Register same schema again
-    changes = register(test_df, "users")
+    changes = register(test_df, "users", store=store, clock=clock)
 
     # Verify no changes
     assert not changes.added
@@ -175,40 +111,23 @@ def test_no_changes(
     assert not changes.changed
 
     # Verify schema history (should not have changed)
-    schema_file = schema_dir / ".drifter" / "users.json"
-    history = json.loads(schema_file.read_text())
+    schema_file = schema_dir / ".drifter" / "users.jsonl"
+    history = [json.loads(line) for line in schema_file.read_text().splitlines()]
     assert len(history) == 1
-    assert history[0]["timestamp"] == "2025-01-01T00:00:00+00:00"
+    assert history[0]["timestamp"] == JAN_1
 
 
 def test_schema_removal(
     test_df: pl.DataFrame,
     schema_dir: Path,
-    monkeypatch: pytest.MonkeyPatch,
+    store: FileSystemStore,
 ) -> None:
     """Test removing fields from schema."""
-    # Mock datetime.now to return fixed timestamps
-    timestamps = iter(
-        [
-            datetime(2025, 1, 1, tzinfo=UTC),
-            datetime(2025, 1, 2, tzinfo=UTC),
-        ],
-    )
-
-    class MockDatetime:
-        UTC = UTC
-
-        @classmethod
-        def now(cls, tz: tzinfo | None = None) -> datetime:
-            return next(timestamps)
-
-    monkeypatch.setattr("drifter.datetime", MockDatetime)
-
-    # Change to temp directory
-    monkeypatch.chdir(schema_dir)
+    # Stamp new versions with fixed timestamps
+    clock = iter([JAN_1, JAN_2]).__next__
 
     # Initial registration
-    register(test_df, "users")
+    register(test_df, "users", store=store, clock=clock)
 
     # Remove a field
     df_with_removed = pl.DataFrame(
@@ -218,7 +137,7 @@ def test_schema_removal(
             # age field removed
         },
     )
-    changes = register(df_with_removed, "users")
+    changes = register(df_with_removed, "users", store=store, clock=clock)
 
     # Verify changes
     assert not changes.added
@@ -227,45 +146,31 @@ def test_schema_removal(
     assert not changes.changed
 
     # Verify schema history
-    schema_file = schema_dir / ".drifter" / "users.json"
-    history = json.loads(schema_file.read_text())
+    schema_file = schema_dir / ".drifter" / "users.jsonl"
+    history = [json.loads(line) for line in schema_file.read_text().splitlines()]
     assert len(history) == 2
-    assert history[0]["timestamp"] == "2025-01-01T00:00:00+00:00"
-    assert history[1]["timestamp"] == "2025-01-02T00:00:00+00:00"
-    # Decode base64 and deserialize the latest DataFrame to verify schema
-    df_bytes = base64.b64decode(history[1]["dataframe"])
-    df1 = pl.DataFrame.deserialize(BytesIO(df_bytes))
-    assert set(df1.schema.names()) == {"id", "name"}
+    assert history[0]["timestamp"] == JAN_1
+    assert history[1]["timestamp"] == JAN_2
+    # Verify the latest stored schema
+    assert set(history[1]["schema"]) == {"id", "name"}
 
 
 def test_corrupted_schema_file(
     test_df: pl.DataFrame,
     schema_dir: Path,
-    monkeypatch: pytest.MonkeyPatch,
+    store: FileSystemStore,
 ) -> None:
     """Test handling of corrupted schema file."""
-    # Mock datetime.now to return a fixed timestamp
-    fixed_dt = datetime(2025, 1, 1, tzinfo=UTC)
-
-    class MockDatetime:
-        UTC = UTC
-
-        @classmethod
-        def now(cls, tz: tzinfo | None = None) -> datetime:
-            return fixed_dt
-
-    monkeypatch.setattr("drifter.datetime", MockDatetime)
-
-    # Change to temp directory
-    monkeypatch.chdir(schema_dir)
+    # Stamp new versions with a fixed timestamp
+    clock = repeat(JAN_1).__next__
 
     # Create corrupted schema file
-    schema_file = schema_dir / ".drifter" / "users.json"
+    schema_file = schema_dir / ".drifter" / "users.jsonl"
     schema_file.parent.mkdir(exist_ok=True)
     schema_file.write_text("invalid json")
 
     # Should handle corrupted file and treat as initial registration
-    changes = register(test_df, "users")
+    changes = register(test_df, "users", store=store, clock=clock)
 
     # Verify changes
     assert len(changes.added) == 3
@@ -275,10 +180,523 @@ def test_corrupted_schema_file(
 
     # Verify schema file was recreated
     assert schema_file.exists()
-    history = json.loads(schema_file.read_text())
+    history = [json.loads(line) for line in schema_file.read_text().splitlines()]
     assert len(history) == 1
-    assert history[0]["timestamp"] == "2025-01-01T00:00:00+00:00"
-    # Decode base64 and deserialize the DataFrame to verify schema
-    df_bytes = base64.b64decode(history[0]["dataframe"])
-    df1 = pl.DataFrame.deserialize(BytesIO(df_bytes))
-    assert set(df1.schema.names()) == {"id", "name", "age"}
+    assert history[0]["timestamp"] == JAN_1
+    # Verify the stored schema
+    assert set(history[0]["schema"]) == {"id", "name", "age"}
+
+
+def test_nested_types_roundtrip(
+    store: FileSystemStore,
+) -> None:
+    """Test that stored nested and parametric types are restored exactly."""
+    schema = {
+        "id": pl.Int64(),
+        "tags": pl.List(pl.String()),
+        "point": pl.Struct({"x": pl.Float64(), "y": pl.Float64()}),
+        "vector": pl.Array(pl.Int8(), 3),
+        "created": pl.Datetime("us", "UTC"),
+        "status": pl.Enum(["active", "inactive"]),
+    }
+    register(pl.DataFrame(schema=schema), "events", store=store)
+
+    # Remove everything but the id
+    changes = register(pl.DataFrame(schema={"id": pl.Int64()}), "events", store=store)
+
+    # Verify the removed types match the registered ones
+    assert {c.name: c.old_type for c in changes.removed} == {
+        name: dtype for name, dtype in schema.items() if name != "id"
+    }
+
+
+@pytest.mark.skipif(
+    not hasattr(pl, "Categories"),
+    reason="Polars has no named categories",
+)
+def test_named_categorical_roundtrip(
+    store: FileSystemStore,
+) -> None:
+    """Test that stored categoricals with named categories are restored."""
+    colour = pl.Categorical(pl.Categories("colours"))
+    register(
+        pl.DataFrame(schema={"id": pl.Int64(), "colour": colour}),
+        "paints",
+        store=store,
+    )
+
+    changes = register(pl.DataFrame(schema={"id": pl.Int64()}), "paints", store=store)
+
+    assert [(c.name, c.old_type) for c in changes.removed] == [("colour", colour)]
+
+
+def test_foreign_dtype_history() -> None:
+    """Test reading types written by a Polars version with other parameters."""
+    store = InMemoryStore()
+    store.append(
+        "paints",
+        {
+            "schema": {"colour": "Categorical(ordering='physical')", "hue": "Hue"},
+            "fingerprint": "",
+            "timestamp": JAN_1,
+        },
+    )
+
+    changes = register(
+        pl.DataFrame(schema={"colour": pl.String(), "hue": pl.Int64()}),
+        "paints",
+        store=store,
+    )
+
+    # Types that cannot be rebuilt fall back to their class, or to Unknown
+    assert [(c.name, c.old_type) for c in changes.changed] == [
+        ("colour", pl.Categorical()),
+        ("hue", pl.Unknown()),
+    ]
+    assert len(store.histories["paints"]) == 2
+
+
+def test_foreign_dtype_repr() -> None:
+    """Test that a type printed differently by another Polars version is kept."""
+    store = InMemoryStore()
+    store.append(
+        "paints",
+        {
+            "schema": {"colour": "Categorical(ordering='physical')"},
+            "fingerprint": "",
+            "timestamp": JAN_1,
+        },
+    )
+
+    changes = register(
+        pl.DataFrame(schema={"colour": pl.Categorical()}),
+        "paints",
+        store=store,
+    )
+
+    # Verify the type is not reported as changed, nor a version added
+    assert not changes
+    assert len(store.histories["paints"]) == 1
+
+
+def test_column_reorder(
+    test_df: pl.DataFrame,
+    schema_dir: Path,
+    store: FileSystemStore,
+) -> None:
+    """Test that reordering columns is not considered a change."""
+    register(test_df, "users", store=store)
+    changes = register(test_df.select(reversed(test_df.columns)), "users", store=store)
+
+    # Verify no changes
+    assert not changes
+
+    # Verify schema history (should not have changed)
+    schema_file = schema_dir / ".drifter" / "users.jsonl"
+    assert len(schema_file.read_text().splitlines()) == 1
+
+
+def test_torn_schema_file(
+    test_df: pl.DataFrame,
+    updated_df: pl.DataFrame,
+    schema_dir: Path,
+    store: FileSystemStore,
+) -> None:
+    """Test that a record torn by an interrupted write keeps the history."""
+    # Initial registration, followed by an interrupted write
+    register(test_df, "users", store=store)
+    schema_file = schema_dir / ".drifter" / "users.jsonl"
+    with schema_file.open("a") as f:
+        f.write('{"schema": {"id": "Int')
+
+    changes = register(updated_df, "users", store=store)
+
+    # Verify changes are relative to the intact version
+    assert [c.name for c in changes.added] == ["email"]
+    assert not changes.removed
+    assert [c.name for c in changes.changed] == ["age"]
+
+    # Verify the new version was written on a line of its own
+    lines = schema_file.read_text().splitlines()
+    assert len(lines) == 3
+    assert set(json.loads(lines[-1])["schema"]) == {"id", "name", "age", "email"}
+
+
+@pytest.mark.parametrize("line", ["null", "1", '"text"', "[]", '{"other": 1}'])
+def test_non_version_line(
+    test_df: pl.DataFrame,
+    updated_df: pl.DataFrame,
+    schema_dir: Path,
+    store: FileSystemStore,
+    line: str,
+) -> None:
+    """Test that a trailing line of valid JSON but no version is skipped."""
+    register(test_df, "users", store=store)
+    schema_file = schema_dir / ".drifter" / "users.jsonl"
+    with schema_file.open("a") as f:
+        f.write(f"{line}\n")
+
+    changes = register(updated_df, "users", store=store)
+
+    # Verify changes are relative to the earlier version, which is kept
+    assert [c.name for c in changes.added] == ["email"]
+    assert [c.name for c in changes.changed] == ["age"]
+    assert len(schema_file.read_text().splitlines()) == 3
+
+
+def test_register_schema(
+    test_df: pl.DataFrame,
+    store: FileSystemStore,
+) -> None:
+    """Test registering a schema without a DataFrame."""
+    register(test_df, "users", store=store)
+
+    # The same schema given on its own is the same version
+    assert not register_schema(test_df.schema, "users", store=store)
+
+    changes = register_schema(
+        pl.Schema({"id": pl.Int64(), "name": pl.String(), "age": pl.Float64()}),
+        "users",
+        store=store,
+    )
+
+    # Verify changes
+    assert not changes.added
+    assert not changes.removed
+    assert [(c.name, c.old_type, c.new_type) for c in changes.changed] == [
+        ("age", pl.Int64(), pl.Float64()),
+    ]
+
+
+def test_dry_run(
+    test_df: pl.DataFrame,
+    updated_df: pl.DataFrame,
+    schema_dir: Path,
+    store: FileSystemStore,
+) -> None:
+    """Test that a dry run reports changes without saving them."""
+    # Initial registration does not create a history
+    changes = register(test_df, "users", store=store, dry_run=True)
+    assert {c.name for c in changes.added} == {"id", "name", "age"}
+    schema_file = schema_dir / ".drifter" / "users.jsonl"
+    assert not schema_file.exists()
+
+    register(test_df, "users", store=store)
+    changes = register(updated_df, "users", store=store, dry_run=True)
+
+    # Verify changes are reported
+    assert [c.name for c in changes.added] == ["email"]
+    assert [c.name for c in changes.changed] == ["age"]
+
+    # Verify schema history (should not have changed)
+    assert len(schema_file.read_text().splitlines()) == 1
+
+    # Registering for real reports the very same changes
+    applied = register(updated_df, "users", store=store)
+    assert applied == changes
+    assert hash(applied) == hash(changes)
+
+
+def test_lazy_registration(
+    test_df: pl.DataFrame,
+    updated_df: pl.DataFrame,
+    store: FileSystemStore,
+) -> None:
+    """Test that a LazyFrame is registered by its schema alone."""
+    register(test_df.lazy(), "users", store=store)
+
+    # A lazy and an eager frame with the same schema are the same version
+    assert not register(test_df, "users", store=store)
+
+    changes = register(updated_df.lazy(), "users", store=store)
+
+    # Verify changes
+    assert [c.name for c in changes.added] == ["email"]
+    assert [c.name for c in changes.changed] == ["age"]
+
+
+def test_tail_read_across_chunks(
+    test_df: pl.DataFrame,
+    updated_df: pl.DataFrame,
+    schema_dir: Path,
+    store: FileSystemStore,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that the latest version is found when it spans several reads."""
+    # Read the file a few bytes at a time so every record spans several reads
+    monkeypatch.setattr("drifter._TAIL_CHUNK_SIZE", 7)
+
+    register(test_df, "users", store=store)
+    register(updated_df, "users", store=store)
+    schema_file = schema_dir / ".drifter" / "users.jsonl"
+    with schema_file.open("a") as f:
+        f.write('{"schema": {"id": "Int')
+
+    # Reverting to the initial schema is measured against the updated one
+    changes = register(test_df, "users", store=store)
+
+    # Verify changes
+    assert not changes.added
+    assert [c.name for c in changes.removed] == ["email"]
+    assert [c.name for c in changes.changed] == ["age"]
+
+
+def test_external_write_within_mtime_granularity(
+    test_df: pl.DataFrame,
+    updated_df: pl.DataFrame,
+    schema_dir: Path,
+    store: FileSystemStore,
+) -> None:
+    """Test that a write keeping the modification time is not missed."""
+    register(test_df, "users", store=store)
+    schema_file = schema_dir / ".drifter" / "users.jsonl"
+    mtime = schema_file.stat().st_mtime_ns
+
+    # Another process appends a version within the same timestamp tick
+    with schema_file.open("a") as f:
+        f.write(json.dumps({"schema": {"id": "Int64"}, "timestamp": JAN_2}) + "\n")
+    os.utime(schema_file, ns=(mtime, mtime))
+
+    changes = register(test_df, "users", store=store)
+
+    # Verify changes are relative to the externally written version
+    assert {c.name for c in changes.added} == {"name", "age"}
+
+
+def test_default_store(
+    test_df: pl.DataFrame,
+    schema_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that histories are kept in the working directory by default."""
+    # Change to temp directory
+    monkeypatch.chdir(schema_dir)
+
+    register(test_df, "users")
+
+    # Verify schema history
+    assert (schema_dir / ".drifter" / "users.jsonl").exists()
+
+
+def test_file_system_store(
+    test_df: pl.DataFrame,
+    updated_df: pl.DataFrame,
+    schema_dir: Path,
+) -> None:
+    """Test keeping schema histories in a chosen directory."""
+    store = FileSystemStore(schema_dir / "schemas")
+
+    register(test_df, "users", store=store)
+    changes = register(updated_df, "users", store=store)
+
+    # Verify changes
+    assert [c.name for c in changes.added] == ["email"]
+    assert [c.name for c in changes.changed] == ["age"]
+
+    # Verify schema history
+    schema_file = schema_dir / "schemas" / "users.jsonl"
+    assert len(schema_file.read_text().splitlines()) == 2
+
+
+def test_file_system_store_str_directory(
+    test_df: pl.DataFrame,
+    schema_dir: Path,
+) -> None:
+    """Test naming the directory of a file system store with a string."""
+    store = FileSystemStore(str(schema_dir / "schemas"))
+
+    register(test_df, "users", store=store)
+
+    # Verify the directory is kept as a path
+    assert store.directory == schema_dir / "schemas"
+    assert (schema_dir / "schemas" / "users.jsonl").exists()
+
+
+def test_unhashable_store(
+    test_df: pl.DataFrame,
+    updated_df: pl.DataFrame,
+) -> None:
+    """Test that stores need not be hashable and are not kept alive."""
+
+    @dataclass
+    class ListStore:
+        versions: list[SchemaVersion] = field(default_factory=list)
+
+        def latest(self, source_id: str) -> SchemaVersion | None:
+            return self.versions[-1] if self.versions else None
+
+        def append(self, source_id: str, version: SchemaVersion) -> None:
+            self.versions.append(version)
+
+    store = ListStore()
+    register(test_df, "users", store=store)
+    changes = register(updated_df, "users", store=store)
+
+    # Verify changes
+    assert [c.name for c in changes.added] == ["email"]
+    assert len(store.versions) == 2
+
+    # Verify registering does not keep the store alive
+    ref = weakref.ref(store)
+    del store
+    gc.collect()
+    assert ref() is None
+
+
+def test_in_memory_store(
+    test_df: pl.DataFrame,
+    updated_df: pl.DataFrame,
+    schema_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test keeping schema histories in memory only."""
+    # Change to temp directory
+    monkeypatch.chdir(schema_dir)
+
+    store = InMemoryStore()
+    register(test_df, "users", store=store)
+    changes = register(updated_df, "users", store=store)
+
+    # Verify changes
+    assert [c.name for c in changes.added] == ["email"]
+    assert [c.name for c in changes.changed] == ["age"]
+
+    # Verify schema history is kept in the store alone
+    assert [set(v["schema"]) for v in store.histories["users"]] == [
+        {"id", "name", "age"},
+        {"id", "name", "age", "email"},
+    ]
+    assert not (schema_dir / ".drifter").exists()
+
+
+def test_file_system_stores_share_locks(
+    test_df: pl.DataFrame,
+    schema_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that stores writing to the same file serialize registrations."""
+    # Widen the window between reading the latest version and appending
+    latest = FileSystemStore.latest
+
+    def slow_latest(self: FileSystemStore, source_id: str) -> SchemaVersion | None:
+        version = latest(self, source_id)
+        time.sleep(0.05)
+        return version
+
+    monkeypatch.setattr(FileSystemStore, "latest", slow_latest)
+
+    stores = [FileSystemStore(schema_dir / "schemas") for _ in range(2)]
+    with ThreadPoolExecutor() as executor:
+        futures = [
+            executor.submit(register, test_df, "users", store=store) for store in stores
+        ]
+    # Verify only the first registration saw the columns as added
+    assert sorted(len(future.result().added) for future in futures) == [0, 3]
+    schema_file = schema_dir / "schemas" / "users.jsonl"
+    assert len(schema_file.read_text().splitlines()) == 1
+
+
+def test_store_without_weak_references(
+    test_df: pl.DataFrame,
+    updated_df: pl.DataFrame,
+) -> None:
+    """Test stores that cannot be weakly referenced."""
+
+    @dataclass(slots=True)
+    class SlottedStore:
+        versions: list[SchemaVersion] = field(default_factory=list)
+
+        def latest(self, source_id: str) -> SchemaVersion | None:
+            return self.versions[-1] if self.versions else None
+
+        def append(self, source_id: str, version: SchemaVersion) -> None:
+            self.versions.append(version)
+
+    store = SlottedStore()
+    register(test_df, "users", store=store)
+    changes = register(updated_df, "users", store=store)
+
+    # Verify changes
+    assert [c.name for c in changes.added] == ["email"]
+    assert len(store.versions) == 2
+
+
+def test_legacy_history_migration(
+    test_df: pl.DataFrame,
+    updated_df: pl.DataFrame,
+    schema_dir: Path,
+    store: FileSystemStore,
+) -> None:
+    """Test that a history in the legacy JSON format is carried over."""
+    # Stamp new versions with a fixed timestamp
+    clock = repeat(JAN_2).__next__
+
+    # Write a history the way earlier versions did
+    legacy_file = schema_dir / ".drifter" / "users.json"
+    legacy_file.parent.mkdir()
+    serialized = base64.b64encode(test_df.clear().serialize()).decode("ascii")
+    legacy = [{"dataframe": serialized, "timestamp": "2025-01-01T00:00:00+00:00"}]
+    legacy_file.write_text(json.dumps(legacy))
+
+    changes = register(updated_df, "users", store=store, clock=clock)
+
+    # Verify changes are relative to the legacy version
+    assert [c.name for c in changes.added] == ["email"]
+    assert [c.name for c in changes.changed] == ["age"]
+
+    # Verify the legacy version was converted ahead of the new one
+    schema_file = schema_dir / ".drifter" / "users.jsonl"
+    history = [json.loads(line) for line in schema_file.read_text().splitlines()]
+    assert [version["timestamp"] for version in history] == [JAN_1, JAN_2]
+    assert set(history[0]["schema"]) == {"id", "name", "age"}
+
+
+def test_legacy_history_dry_run(
+    test_df: pl.DataFrame,
+    updated_df: pl.DataFrame,
+    schema_dir: Path,
+    store: FileSystemStore,
+) -> None:
+    """Test that a dry run reads a legacy history without converting it."""
+    # Write a history the way earlier versions did
+    legacy_file = schema_dir / ".drifter" / "users.json"
+    legacy_file.parent.mkdir()
+    serialized = base64.b64encode(test_df.clear().serialize()).decode("ascii")
+    legacy = [{"dataframe": serialized, "timestamp": "2025-01-01T00:00:00+00:00"}]
+    legacy_file.write_text(json.dumps(legacy))
+
+    changes = register(updated_df, "users", store=store, dry_run=True)
+
+    # Verify changes are relative to the legacy version
+    assert [c.name for c in changes.added] == ["email"]
+    assert [c.name for c in changes.changed] == ["age"]
+
+    # Verify nothing was written
+    assert sorted(p.name for p in legacy_file.parent.iterdir()) == ["users.json"]
+
+
+def test_register_many(
+    test_df: pl.DataFrame,
+    updated_df: pl.DataFrame,
+    schema_dir: Path,
+    store: FileSystemStore,
+) -> None:
+    """Test registering several sources at once."""
+    register(test_df, "users", store=store)
+    changes = register_many(
+        [(updated_df, "users"), (test_df, "accounts")],
+        store=store,
+    )
+
+    # Verify changes are reported per source
+    assert [c.name for c in changes["users"].added] == ["email"]
+    assert [c.name for c in changes["users"].changed] == ["age"]
+    assert {c.name for c in changes["accounts"].added} == {"id", "name", "age"}
+
+    # Verify each source got its own history
+    assert (schema_dir / ".drifter" / "users.jsonl").exists()
+    assert (schema_dir / ".drifter" / "accounts.jsonl").exists()
+
+    # A source may only appear once
+    with pytest.raises(ValueError, match="once per call"):
+        register_many([(test_df, "users"), (updated_df, "users")], store=store)